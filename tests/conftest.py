@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from typing import Any
 
 import pytest
@@ -10,16 +11,29 @@ from pymatgen.core import Structure
 
 from torch_sim.io import atoms_to_state
 from torch_sim.models.lennard_jones import LennardJonesModel
+from torch_sim.optimizers import unit_cell_fire
 from torch_sim.state import SimState, concatenate_states
 from torch_sim.unbatched.models.lennard_jones import UnbatchedLennardJonesModel
 
 
-@pytest.fixture
+def _si_atoms() -> Atoms:
+    return bulk("Si", "diamond", a=5.43, cubic=True)
+
+
+def _fe_atoms() -> Atoms:
+    return bulk("Fe", "fcc", a=5.26, cubic=True)
+
+
+def _fe_supercell_atoms(fe_atoms: Atoms) -> Atoms:
+    return fe_atoms.repeat([4, 4, 4])
+
+
+@pytest.fixture(scope="session")
 def device() -> torch.device:
     return torch.device("cpu")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def dtype() -> torch.dtype:
     return torch.float64
 
@@ -33,13 +47,13 @@ def ar_atoms() -> Atoms:
 @pytest.fixture
 def fe_atoms() -> Atoms:
     """Create crystalline iron using ASE."""
-    return bulk("Fe", "fcc", a=5.26, cubic=True)
+    return _fe_atoms()
 
 
 @pytest.fixture
 def si_atoms() -> Atoms:
     """Create crystalline silicon using ASE."""
-    return bulk("Si", "diamond", a=5.43, cubic=True)
+    return _si_atoms()
 
 
 @pytest.fixture
@@ -224,7 +238,7 @@ def fe_supercell_sim_state(
     fe_atoms: Atoms, device: torch.device, dtype: torch.dtype
 ) -> Any:
     """Create a face-centered cubic (FCC) iron structure with 4x4x4 supercell."""
-    return atoms_to_state(fe_atoms.repeat([4, 4, 4]), device, dtype)
+    return atoms_to_state(_fe_supercell_atoms(fe_atoms), device, dtype)
 
 
 @pytest.fixture
@@ -278,7 +292,7 @@ def unbatched_lj_model(
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def lj_model(device: torch.device, dtype: torch.dtype) -> LennardJonesModel:
     """Create a Lennard-Jones model with reasonable parameters for Ar."""
     return LennardJonesModel(
@@ -291,3 +305,20 @@ def lj_model(device: torch.device, dtype: torch.dtype) -> LennardJonesModel:
         compute_stress=True,
         cutoff=2.5 * 3.405,
     )
+
+
+@pytest.fixture(scope="session")
+def lj_fire_setup(
+    lj_model: LennardJonesModel, device: torch.device, dtype: torch.dtype
+) -> tuple[Callable, SimState, SimState]:
+    """Create the unit cell FIRE update function and initialized Si and Fe states.
+
+    Session-scoped so the Lennard-Jones forward pass in fire_init runs once. Tests
+    must not mutate the returned states in place; clone or concatenate them first.
+    """
+    fire_init, fire_update = unit_cell_fire(lj_model)
+    si_state = atoms_to_state(_si_atoms(), device, dtype)
+    fe_state = atoms_to_state(_fe_supercell_atoms(_fe_atoms()), device, dtype)
+    si_fire_state = fire_init(si_state)
+    fe_fire_state = fire_init(fe_state)
+    return fire_update, si_fire_state, fe_fire_state
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from typing import Any
 
 import pytest
@@ -6,13 +7,13 @@ import torch
 from torch_sim.autobatching import (
     ChunkingAutoBatcher,
     HotSwappingAutoBatcher,
+    calculate_batched_memory_scalers,
     calculate_memory_scaler,
     determine_max_batch_size,
     to_constant_volume_bins,
 )
 from torch_sim.models.lennard_jones import LennardJonesModel
-from torch_sim.optimizers import unit_cell_fire
-from torch_sim.state import SimState
+from torch_sim.state import SimState, concatenate_states
 
 
 def test_exact_fit():
@@ -106,6 +107,47 @@ def test_calculate_scaling_metric(si_sim_state: SimState) -> None:
         calculate_memory_scaler(si_sim_state, "invalid_metric")
 
 
+def test_calculate_memory_scaler_batched(
+    si_sim_state: SimState, si_double_sim_state: SimState
+) -> None:
+    """Test that memory scaling metrics of a batched state sum over batches."""
+    for metric in ("n_atoms", "n_atoms_x_density"):
+        single_metric = calculate_memory_scaler(si_sim_state, metric)
+        double_metric = calculate_memory_scaler(si_double_sim_state, metric)
+        assert pytest.approx(double_metric, rel=1e-5) == 2 * single_metric
+
+
+def test_calculate_batched_memory_scalers(
+    si_sim_state: SimState, fe_supercell_sim_state: SimState
+) -> None:
+    """Test that batched memory scaling metrics match the per-state metrics."""
+    batched_state = concatenate_states([si_sim_state, fe_supercell_sim_state])
+    for metric in ("n_atoms", "n_atoms_x_density"):
+        batched_metrics = calculate_batched_memory_scalers(batched_state, metric)
+        expected = [
+            calculate_memory_scaler(si_sim_state, metric),
+            calculate_memory_scaler(fe_supercell_sim_state, metric),
+        ]
+        assert batched_metrics == pytest.approx(expected, rel=1e-5)
+
+    with pytest.raises(ValueError, match="Invalid metric"):
+        calculate_batched_memory_scalers(batched_state, "invalid_metric")
+
+
+def test_chunking_auto_batcher_batched_state(
+    si_sim_state: SimState, fe_supercell_sim_state: SimState, lj_model: LennardJonesModel
+) -> None:
+    """Test that ChunkingAutoBatcher computes metrics of a batched state per batch."""
+    batcher = ChunkingAutoBatcher(
+        model=lj_model, memory_scales_with="n_atoms", max_memory_scaler=260.0
+    )
+    batcher.load_states(concatenate_states([si_sim_state, fe_supercell_sim_state]))
+
+    expected = [si_sim_state.n_atoms, fe_supercell_sim_state.n_atoms]
+    assert batcher.memory_scalers == expected
+    assert len(batcher.state_slices) == 2
+
+
 def test_split_state(si_double_sim_state: SimState) -> None:
     """Test splitting a batched state into individual states."""
     split_states = si_double_sim_state.split()
@@ -113,15 +155,16 @@ def test_split_state(si_double_sim_state: SimState) -> None:
     # Check we get the right number of states
     assert len(split_states) == 2
 
+    # Each split state should have batch indices reset to 0
+    all_batches = torch.cat([state.batch for state in split_states])
+    assert torch.count_nonzero(all_batches).item() == 0
+
     # Check each state has the correct properties
-    for state in enumerate(split_states):
-        assert state[1].n_batches == 1
-        assert torch.all(
-            state[1].batch == 0
-        )  # Each split state should have batch indices reset to 0
-        assert state[1].n_atoms == si_double_sim_state.n_atoms // 2
-        assert state[1].positions.shape[0] == si_double_sim_state.n_atoms // 2
-        assert state[1].cell.shape[0] == 1
+    n_atoms = si_double_sim_state.n_atoms // 2
+    assert [state.n_batches for state in split_states] == [1, 1]
+    assert [state.n_atoms for state in split_states] == [n_atoms, n_atoms]
+    assert [state.positions.shape[0] for state in split_states] == [n_atoms, n_atoms]
+    assert [state.cell.shape[0] for state in split_states] == [1, 1]
 
 
 def test_chunking_auto_batcher(
@@ -159,8 +202,8 @@ def test_chunking_auto_batcher(
     assert restored_states[1].n_atoms == states[1].n_atoms
 
     # Check atomic numbers to verify the correct order
-    assert torch.all(restored_states[0].atomic_numbers == states[0].atomic_numbers)
-    assert torch.all(restored_states[1].atomic_numbers == states[1].atomic_numbers)
+    assert torch.equal(restored_states[0].atomic_numbers, states[0].atomic_numbers)
+    assert torch.equal(restored_states[1].atomic_numbers, states[1].atomic_numbers)
 
 
 def test_chunking_auto_batcher_with_indices(
@@ -178,9 +221,7 @@ def test_chunking_auto_batcher_with_indices(
     batcher.load_states(states)
 
     # Get batches with indices
-    batches_with_indices = []
-    for batch, indices in batcher:
-        batches_with_indices.append((batch, indices))
+    batches_with_indices = list(batcher)
 
     # Check we got the expected number of batches
     assert len(batches_with_indices) == len(batcher.batched_states)
@@ -206,14 +247,7 @@ def test_chunking_auto_batcher_restore_order_with_split_states(
     batcher.load_states(states)
 
     # Get batches until None is returned
-    batches = []
-    while True:
-        batch = batcher.next_batch()
-        if batch is None:
-            break
-        # Split each batch into individual states to simulate processing
-        # split_batch = split_state(batch)
-        batches.append(batch)
+    batches = list(batcher)
 
     # Test restore_original_order with split states
     # This tests the chain.from_iterable functionality
@@ -227,8 +261,8 @@ def test_chunking_auto_batcher_restore_order_with_split_states(
     assert restored_states[1].n_atoms == states[1].n_atoms
 
     # Check atomic numbers to verify the correct order
-    assert torch.all(restored_states[0].atomic_numbers == states[0].atomic_numbers)
-    assert torch.all(restored_states[1].atomic_numbers == states[1].atomic_numbers)
+    assert torch.equal(restored_states[0].atomic_numbers, states[0].atomic_numbers)
+    assert torch.equal(restored_states[1].atomic_numbers, states[1].atomic_numbers)
 
 
 def test_hot_swapping_max_metric_too_small(
@@ -351,8 +385,8 @@ def test_hot_swapping_auto_batcher_restore_order(
     assert restored_states[1].n_atoms == states[1].n_atoms
 
     # Check atomic numbers to verify the correct order
-    assert torch.all(restored_states[0].atomic_numbers == states[0].atomic_numbers)
-    assert torch.all(restored_states[1].atomic_numbers == states[1].atomic_numbers)
+    assert torch.equal(restored_states[0].atomic_numbers, states[0].atomic_numbers)
+    assert torch.equal(restored_states[1].atomic_numbers, states[1].atomic_numbers)
 
     # # Test error when number of states doesn't match
     # with pytest.raises(
@@ -361,18 +395,34 @@ def test_hot_swapping_auto_batcher_restore_order(
     #     batcher.restore_original_order([si_sim_state])
 
 
-def test_hot_swapping_with_fire(
-    si_sim_state: SimState, fe_supercell_sim_state: SimState, lj_model: LennardJonesModel
-) -> None:
-    fire_init, fire_update = unit_cell_fire(lj_model)
+@pytest.fixture(scope="module")
+def fire_state_pool(
+    lj_fire_setup: tuple[Callable, SimState, SimState],
+) -> tuple[Callable, SimState]:
+    """Create a batched state of 5 Si and 5 Fe FIRE states with perturbed positions.
+
+    Concatenating first makes the copy and perturbation a single allocation and a
+    single RNG call. The batchers never modify their input states, so tests can
+    share the pool by splitting it into per-system views.
+    """
+    fire_update, si_fire_state, fe_fire_state = lj_fire_setup
+    fire_state = concatenate_states([si_fire_state, fe_fire_state] * 5)
+    generator = torch.Generator(device=fire_state.device).manual_seed(0)
+    noise = torch.randn(
+        fire_state.positions.shape,
+        generator=generator,
+        device=fire_state.device,
+        dtype=fire_state.dtype,
+    )
+    fire_state.positions.add_(noise, alpha=0.01)
+    return fire_update, fire_state
 
-    si_fire_state = fire_init(si_sim_state)
-    fe_fire_state = fire_init(fe_supercell_sim_state)
 
-    fire_states = [si_fire_state, fe_fire_state] * 5
-    fire_states = [state.clone() for state in fire_states]
-    for state in fire_states:
-        state.positions += torch.randn_like(state.positions) * 0.01
+def test_hot_swapping_with_fire(
+    fire_state_pool: tuple[Callable, SimState], lj_model: LennardJonesModel
+) -> None:
+    fire_update, fire_state = fire_state_pool
+    fire_states = fire_state.split()
 
     batcher = HotSwappingAutoBatcher(
         model=lj_model,
@@ -382,26 +432,24 @@ def test_hot_swapping_with_fire(
     )
     batcher.load_states(fire_states)
 
-    def convergence_fn(state: SimState) -> bool:
-        batch_wise_max_force = torch.zeros(
-            state.n_batches, device=state.device, dtype=torch.float64
-        )
+    def convergence_fn(state: SimState) -> torch.Tensor:
         max_forces = state.forces.norm(dim=1)
-        batch_wise_max_force = batch_wise_max_force.scatter_reduce(
-            dim=0, index=state.batch, src=max_forces, reduce="amax"
+        # batch indices are sorted after concatenation, so segment lengths suffice
+        batch_counts = torch.bincount(state.batch, minlength=state.n_batches)
+        batch_wise_max_force = torch.segment_reduce(
+            max_forces, reduce="max", lengths=batch_counts
         )
         return batch_wise_max_force < 5e-1
 
-    all_completed_states, convergence_tensor = [], None
+    state, all_completed_states, convergence_tensor = None, [], None
     while True:
-        print(f"Starting new batch of {state.n_batches} states.")
-
         state, completed_states = batcher.next_batch(state, convergence_tensor)
         print("Number of completed states", len(completed_states))
 
         all_completed_states.extend(completed_states)
         if state is None:
             break
+        print(f"Starting new batch of {state.n_batches} states.")
 
         # run 10 steps, arbitrary number
         for _ in range(10):
@@ -412,21 +460,10 @@ def test_hot_swapping_with_fire(
 
 
 def test_chunking_auto_batcher_with_fire(
-    si_sim_state: SimState, fe_supercell_sim_state: SimState, lj_model: LennardJonesModel
+    fire_state_pool: tuple[Callable, SimState], lj_model: LennardJonesModel
 ) -> None:
-    fire_init, fire_update = unit_cell_fire(lj_model)
-
-    si_fire_state = fire_init(si_sim_state)
-    fe_fire_state = fire_init(fe_supercell_sim_state)
-
-    fire_states = [si_fire_state, fe_fire_state] * 5
-    fire_states = [state.clone() for state in fire_states]
-    for state in fire_states:
-        state.positions += torch.randn_like(state.positions) * 0.01
-
-    batch_lengths = [state.n_atoms for state in fire_states]
-    optimal_batches = to_constant_volume_bins(batch_lengths, 400)
-    optimal_n_batches = len(optimal_batches)
+    fire_update, fire_state = fire_state_pool
+    fire_states = fire_state.split()
 
     batcher = ChunkingAutoBatcher(
         model=lj_model, memory_scales_with="n_atoms", max_memory_scaler=400
@@ -444,10 +481,11 @@ def test_chunking_auto_batcher_with_fire(
 
     restored_states = batcher.restore_original_order(finished_states)
     assert len(restored_states) == len(fire_states)
-    for restored, original in zip(restored_states, fire_states, strict=True):
-        assert torch.all(restored.atomic_numbers == original.atomic_numbers)
-    # analytically determined to be optimal
-    assert n_batches == optimal_n_batches
+    restored_atomic_numbers = torch.cat([s.atomic_numbers for s in restored_states])
+    assert torch.equal(restored_atomic_numbers, fire_state.atomic_numbers)
+    # analytically determined to be optimal: no two 256 atom Fe supercells fit
+    # in a bin of 400, and all five 8 atom Si cells fit alongside one of them
+    assert n_batches == 5
 
 
 def test_hot_swapping_max_iterations(
@@ -329,11 +329,10 @@ def calculate_memory_scaler(
             Defaults to "n_atoms_x_density".
 
     Returns:
-        float: Calculated metric value.
+        float: Calculated metric value, summed over batches for batched states.
 
     Raises:
-        ValueError: If state has multiple batches or if an invalid metric type is
-            provided.
+        ValueError: If an invalid metric type is provided.
 
     Example::
 
@@ -343,14 +342,45 @@ def calculate_memory_scaler(
         # Calculate memory scaling factor based on atom count and density
         metric = calculate_memory_scaler(state, memory_scales_with="n_atoms_x_density")
     """
-    if state.n_batches > 1:
-        return sum(calculate_memory_scaler(s, memory_scales_with) for s in state.split())
     if memory_scales_with == "n_atoms":
         return state.n_atoms
+    return sum(calculate_batched_memory_scalers(state, memory_scales_with))
+
+
+def calculate_batched_memory_scalers(
+    state: SimState,
+    memory_scales_with: Literal["n_atoms_x_density", "n_atoms"] = "n_atoms_x_density",
+) -> list[float]:
+    """Calculate the memory scaling metric of every batch in a state.
+
+    Computes the same metrics as calculate_memory_scaler, but for all batches at
+    once, without splitting the state. The cell volumes of all batches are obtained
+    from a single batched determinant.
+
+    Args:
+        state (SimState): State to calculate metrics for, with shape information
+            specific to the SimState instance.
+        memory_scales_with ("n_atoms_x_density" | "n_atoms"): Type of metric
+            to use. See calculate_memory_scaler for details.
+            Defaults to "n_atoms_x_density".
+
+    Returns:
+        list[float]: Metric value of each batch, in batch order.
+
+    Raises:
+        ValueError: If an invalid metric type is provided.
+
+    Example::
+
+        # Calculate memory scaling factors of all batches in a batched state
+        metrics = calculate_batched_memory_scalers(batched_state)
+    """
+    n_atoms = torch.bincount(state.batch, minlength=state.n_batches)
+    if memory_scales_with == "n_atoms":
+        return n_atoms.tolist()
     if memory_scales_with == "n_atoms_x_density":
-        volume = torch.abs(torch.linalg.det(state.cell[0])) / 1000
-        number_density = state.n_atoms / volume.item()
-        return state.n_atoms * number_density
+        volumes = torch.abs(torch.linalg.det(state.cell)) / 1000
+        return (n_atoms * n_atoms / volumes).tolist()
     raise ValueError(f"Invalid metric: {memory_scales_with}")
 
 
@@ -527,11 +557,17 @@ class ChunkingAutoBatcher:
             This method resets the current state bin index, so any ongoing iteration
             will be restarted when this method is called.
         """
-        self.state_slices = states.split() if isinstance(states, SimState) else states
-        self.memory_scalers = [
-            calculate_memory_scaler(state_slice, self.memory_scales_with)
-            for state_slice in self.state_slices
-        ]
+        if isinstance(states, SimState):
+            self.memory_scalers = calculate_batched_memory_scalers(
+                states, self.memory_scales_with
+            )
+            self.state_slices = states.split()
+        else:
+            self.state_slices = states
+            self.memory_scalers = [
+                calculate_memory_scaler(state_slice, self.memory_scales_with)
+                for state_slice in self.state_slices
+            ]
         if not self.max_memory_scaler:
             self.max_memory_scaler = estimate_max_memory_scaler(
                 self.model,